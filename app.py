@@ -1,10 +1,12 @@
 import streamlit as st
-import plotly.graph_objects as go
-from modules.parser import ContractParser
+from modules.parser import ContractParser, SectionIndex
 from modules.nlp_engine import LegalNLPEngine
 from modules.risk_analyzer import RiskAnalyzer
 from modules.llm_assistant import ClaudeAssistant
-import json
+from modules.text_index import TextIndex
+import hashlib
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -38,17 +40,64 @@ if 'analysis_done' not in st.session_state:
 if 'contract_data' not in st.session_state:
     st.session_state.contract_data = None
 
-# Initialize components
+# Initialize components - each is built once per server process and
+# shared by reference across reruns and sessions, so pattern compilation,
+# automata and Hyperscan setup in __init__ never repeat
 @st.cache_resource
-def load_components():
-    parser = ContractParser()
-    nlp_engine = LegalNLPEngine()
-    risk_analyzer = RiskAnalyzer()
+def get_parser():
+    return ContractParser()
+
+@st.cache_resource
+def get_nlp_engine():
+    return LegalNLPEngine()
+
+@st.cache_resource
+def get_risk_analyzer():
+    return RiskAnalyzer()
+
+@st.cache_resource
+def get_assistant():
     api_key = os.getenv('GEMINI_API_KEY')
-    assistant = ClaudeAssistant(api_key) if api_key else None
-    return parser, nlp_engine, risk_analyzer, assistant
+    return ClaudeAssistant(api_key) if api_key else None
+
+assistant = get_assistant()
+
+# Cached analysis stages - re-analyzing the same file skips the pipeline.
+# Parsing is keyed on the file's SHA-256 and later stages on the text;
+# underscore arguments (_data, _index, _sections) are not hashed.
+# st.cache_data already memoizes on the text and copies its results, so the
+# stages call the undecorated analyzer methods and skip memoize_by_text.
+@st.cache_data(show_spinner=False, ttl=3600)
+def _parse(file_hash: str, ext: str, _data: bytes) -> dict:
+    return get_parser().parse_document(_data, ext)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _extract_entities(text: str, _index: TextIndex) -> dict:
+    return LegalNLPEngine.extract_entities.__wrapped__(get_nlp_engine(), _index)
 
-parser, nlp_engine, risk_analyzer, assistant = load_components()
+@st.cache_data(show_spinner=False, ttl=3600)
+def _classify(text: str, _index: TextIndex) -> dict:
+    return LegalNLPEngine.classify_clauses.__wrapped__(get_nlp_engine(), _index)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _ambiguous(text: str, _index: TextIndex) -> list:
+    return LegalNLPEngine.detect_ambiguous_terms.__wrapped__(get_nlp_engine(), _index)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _risks(text: str, _index: TextIndex, entities: dict, _sections: SectionIndex) -> dict:
+    return RiskAnalyzer.analyze_contract.__wrapped__(get_risk_analyzer(), _index, entities, _sections)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _compliance(text: str, _index: TextIndex, contract_type: str) -> list:
+    return get_risk_analyzer().check_indian_compliance(_index, contract_type)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def _export_json(filename: str, timestamp: str, _data: dict) -> bytes:
+    return orjson.dumps(
+        _data,
+        default=lambda o: o.to_list() if isinstance(o, SectionIndex) else str(o),
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+    )
 
 # Main content
 st.markdown('<p class="main-header">⚖️ Contract Intelligence Platform</p>', unsafe_allow_html=True)
@@ -68,29 +117,51 @@ if uploaded_file:
     if st.button("🚀 Start Analysis", type="primary"):
         with st.spinner("🔍 Analyzing contract..."):
             try:
-                # Save file temporarily
-                temp_path = f"temp_{uploaded_file.name}"
-                with open(temp_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                
                 # Parse document
+                with uploaded_file.getbuffer() as view:
+                    file_hash = hashlib.sha256(view).hexdigest()
                 file_ext = uploaded_file.name.split('.')[-1]
-                parsed = parser.parse_document(temp_path, file_ext)
+                parsed = _parse(file_hash, file_ext, uploaded_file.getvalue())
                 
-                # NLP Analysis
-                entities = nlp_engine.extract_entities(parsed['raw_text'])
-                classified = nlp_engine.classify_clauses(parsed['raw_text'])
-                ambiguous = nlp_engine.detect_ambiguous_terms(parsed['raw_text'])
+                # Index the text once and share it across every stage
+                text = parsed['raw_text']
+                index = TextIndex(text)
                 
-                # Risk Analysis
-                risks = risk_analyzer.analyze_contract(parsed['raw_text'], entities)
-                compliance = risk_analyzer.check_indian_compliance(parsed['raw_text'], 'general')
-                
-                # AI Analysis
-                # AI Analysis - Temporarily disabled
+                # Fallbacks when the AI assistant is unavailable
                 contract_type = "Service Agreement (auto-detected)"
                 summary = "This contract has been analyzed using rule-based NLP. Risk scoring and entity extraction are complete. AI-powered summaries are temporarily unavailable due to API quota limits."
                 
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    # Classify on the network while the local pipeline runs on the CPU
+                    type_future = executor.submit(assistant.classify_contract_type, text) if assistant else None
+                    
+                    # NLP Analysis
+                    entities = _extract_entities(text, index)
+                    classified = _classify(text, index)
+                    ambiguous = _ambiguous(text, index)
+                    
+                    # Risk Analysis
+                    risks = _risks(text, index, entities, parsed['sections'])
+                    compliance = _compliance(text, index, 'general')
+                    
+                    # AI Analysis - the summary needs local results, so stream it as it arrives
+                    if assistant:
+                        streamed = ""
+                        summary_box = st.empty()
+                        try:
+                            for chunk in assistant.stream_plain_summary(text, entities, risks):
+                                streamed += chunk
+                                summary_box.info(streamed)
+                            if streamed:
+                                summary = streamed
+                        except Exception:
+                            # Discard any partial text and keep the rule-based summary
+                            summary_box.empty()
+                        
+                        detected_type = type_future.result().strip()
+                        if detected_type and not detected_type.startswith("Error"):
+                            contract_type = detected_type
+                
                 # Store results
                 st.session_state.contract_data = {
                     'parsed': parsed,
@@ -107,8 +178,6 @@ if uploaded_file:
                 
                 st.session_state.analysis_done = True
                 
-                # Cleanup
-                os.remove(temp_path)
                 st.success("✅ Analysis complete!")
                 st.rerun()
                 
@@ -214,7 +283,8 @@ if st.session_state.analysis_done and st.session_state.contract_data:
     
     # Export
     st.markdown("### 💾 Export")
-    json_data = json.dumps(st.session_state.contract_data, indent=2, default=str)
+    # Serialized once per analysis; reruns reuse the cached bytes
+    json_data = _export_json(data['filename'], data['timestamp'], data)
     st.download_button(
         label="📥 Download Analysis (JSON)",
         data=json_data,
@@ -1,12 +1,20 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List
 import json
 
 class ClaudeAssistant:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+        self.stream_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent"
+        self.timeout = 30
+        
+        # Reuse keep-alive connections instead of a new TLS handshake per prompt;
+        # every call goes to the same host, shared by concurrent sessions
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
     
     def _call_gemini(self, prompt: str) -> str:
         """Call Gemini API directly via REST"""
@@ -25,7 +33,7 @@ class ClaudeAssistant:
                 "Content-Type": "application/json"
             }
             
-            response = requests.post(url, json=payload, headers=headers)
+            response = self._session.post(url, json=payload, headers=headers, timeout=self.timeout)
             
             if response.status_code == 200:
                 result = response.json()
@@ -35,10 +43,49 @@ class ClaudeAssistant:
         except Exception as e:
             return f"Error calling API: {str(e)}"
     
-    def generate_plain_summary(self, contract_text: str, entities: Dict, risk_analysis: Dict) -> str:
-        """Generate business-friendly contract summary"""
+    def _stream_gemini(self, prompt: str) -> Iterator[str]:
+        """Call Gemini with server-sent events, yielding text chunks as they arrive
+        
+        Unlike _call_gemini, failures raise instead of returning an error
+        string, since part of the response may already have been yielded.
+        """
+        url = f"{self.stream_url}?alt=sse&key={self.api_key}"
+        
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }]
+        }
+        
+        headers = {
+            "Content-Type": "application/json"
+        }
         
-        prompt = f"""You are a legal assistant helping small business owners understand contracts.
+        with self._session.post(url, json=payload, headers=headers, stream=True, timeout=self.timeout) as response:
+            # Server-sent events are always UTF-8, but text/event-stream carries
+            # no charset, so requests would otherwise decode as ISO-8859-1
+            response.encoding = 'utf-8'
+            if response.status_code != 200:
+                raise requests.HTTPError(f"Error: {response.status_code} - {response.text}", response=response)
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                chunk = json.loads(line[len("data:"):])
+                # The closing chunk may carry only a finishReason or usage metadata
+                candidates = chunk.get('candidates')
+                if not candidates:
+                    continue
+                for part in candidates[0].get('content', {}).get('parts', []):
+                    if part.get('text'):
+                        yield part['text']
+    
+    def _summary_prompt(self, contract_text: str, entities: Dict, risk_analysis: Dict) -> str:
+        """Build the plain-language summary prompt"""
+        
+        return f"""You are a legal assistant helping small business owners understand contracts.
 
 Contract Text (excerpts):
 {contract_text[:3000]}
@@ -61,8 +108,17 @@ Task: Create a 4-5 sentence plain-language summary for a busy business owner. Fo
 5. Overall recommendation
 
 Use simple business language, avoid legal jargon. Be direct and actionable."""
-
-        return self._call_gemini(prompt)
+    
+    def generate_plain_summary(self, contract_text: str, entities: Dict, risk_analysis: Dict) -> str:
+        """Generate business-friendly contract summary"""
+        return self._call_gemini(self._summary_prompt(contract_text, entities, risk_analysis))
+    
+    def stream_plain_summary(self, contract_text: str, entities: Dict, risk_analysis: Dict) -> Iterator[str]:
+        """Generate business-friendly contract summary, streamed in chunks
+        
+        Iterating raises if the request fails, including partway through.
+        """
+        return self._stream_gemini(self._summary_prompt(contract_text, entities, risk_analysis))
     
     def explain_clause(self, clause_text: str, context: str = "") -> Dict:
         """Explain a specific clause in plain language"""
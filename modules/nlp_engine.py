@@ -1,5 +1,7 @@
 import re
 from collections import Counter
+import ahocorasick
+from modules.text_index import as_text_index, memoize_by_text
 
 class LegalNLPEngine:
     def __init__(self):
@@ -20,9 +22,39 @@ class LegalNLPEngine:
         self.obligation_markers = ['shall', 'must', 'required to', 'obligated to', 'agrees to']
         self.right_markers = ['may', 'entitled to', 'has the right to', 'permitted to']
         self.prohibition_markers = ['shall not', 'must not', 'prohibited from', 'restricted from']
+        
+        # Vague language that may lead to disputes
+        self.ambiguous_terms = [
+            'reasonable', 'appropriate', 'as soon as possible', 'promptly',
+            'substantial', 'material', 'best efforts', 'good faith',
+            'approximately', 'around', 'may', 'might', 'could'
+        ]
+        
+        # Compile patterns once so each call skips the re module's pattern cache
+        self.compiled_legal_patterns = {
+            entity_type: [re.compile(p) for p in patterns]
+            for entity_type, patterns in self.legal_patterns.items()
+        }
+        self.org_pattern = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Ltd|Limited|Inc|Corp|Company|Pvt)\b')
+        self.prohibition_re = self._compile_markers(self.prohibition_markers)
+        self.obligation_re = self._compile_markers(self.obligation_markers)
+        self.right_re = self._compile_markers(self.right_markers)
+        
+        # Aho-Corasick automaton finds every ambiguous term in one pass
+        self.ambiguous_automaton = ahocorasick.Automaton()
+        for idx, term in enumerate(self.ambiguous_terms):
+            self.ambiguous_automaton.add_word(term, (idx, term))
+        self.ambiguous_automaton.make_automaton()
+    
+    @staticmethod
+    def _compile_markers(markers):
+        """Compile a marker list into one case-insensitive word-bounded regex"""
+        return re.compile(r'(?i)\b(' + '|'.join(map(re.escape, markers)) + r')\b')
     
+    @memoize_by_text()
     def extract_entities(self, text):
         """Extract named entities using regex patterns"""
+        text = as_text_index(text).text
         entities = {
             'organizations': [],
             'persons': [],
@@ -34,27 +66,25 @@ class LegalNLPEngine:
         
         # Simple regex-based extraction
         # Organizations - look for capitalized words
-        org_pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Ltd|Limited|Inc|Corp|Company|Pvt)\b'
-        entities['organizations'] = list(set(re.findall(org_pattern, text)))
+        entities['organizations'] = list(dict.fromkeys(self.org_pattern.findall(text)))
         
         # Custom pattern matching
-        for entity_type, patterns in self.legal_patterns.items():
+        for entity_type, patterns in self.compiled_legal_patterns.items():
             matches = []
             for pattern in patterns:
-                found = re.findall(pattern, text)
+                found = pattern.findall(text)
                 if found and isinstance(found[0], tuple):
                     matches.extend([m for group in found for m in group if m])
                 else:
                     matches.extend(found)
-            entities['custom'][entity_type] = list(set(matches))
+            entities['custom'][entity_type] = list(dict.fromkeys(matches))
         
         return entities
     
+    @memoize_by_text()
     def classify_clauses(self, text):
         """Classify clauses as obligations, rights, or prohibitions"""
-        # Split into sentences using simple method
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        index = as_text_index(text)
         
         classified = {
             'obligations': [],
@@ -62,43 +92,36 @@ class LegalNLPEngine:
             'prohibitions': []
         }
         
-        for sent in sentences:
-            sent_lower = sent.lower()
-            
+        for _, sent in index.sentences:
             # Check for prohibitions first (more specific)
-            if any(marker in sent_lower for marker in self.prohibition_markers):
+            if self.prohibition_re.search(sent):
                 classified['prohibitions'].append(sent)
             # Then obligations
-            elif any(marker in sent_lower for marker in self.obligation_markers):
+            elif self.obligation_re.search(sent):
                 classified['obligations'].append(sent)
             # Then rights
-            elif any(marker in sent_lower for marker in self.right_markers):
+            elif self.right_re.search(sent):
                 classified['rights'].append(sent)
         
         return classified
     
+    @memoize_by_text()
     def detect_ambiguous_terms(self, text):
         """Flag vague or ambiguous language"""
-        ambiguous_terms = [
-            'reasonable', 'appropriate', 'as soon as possible', 'promptly',
-            'substantial', 'material', 'best efforts', 'good faith',
-            'approximately', 'around', 'may', 'might', 'could'
-        ]
+        index = as_text_index(text)
         
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        found = {}
+        for end, (idx, term) in self.ambiguous_automaton.iter(index.lower):
+            sent_idx = index.sentence_at(index.text_offset(end - len(term) + 1))
+            found.setdefault(sent_idx, set()).add(idx)
         
         flagged = []
         
-        for sent in sentences:
-            sent_lower = sent.lower()
-            found_terms = [term for term in ambiguous_terms if term in sent_lower]
-            
-            if found_terms:
-                flagged.append({
-                    'sentence': sent,
-                    'terms': found_terms,
-                    'concern': 'Vague language may lead to disputes'
-                })
+        for sent_idx in sorted(found):
+            flagged.append({
+                'sentence': index.sentences[sent_idx][1],
+                'terms': [self.ambiguous_terms[idx] for idx in sorted(found[sent_idx])],
+                'concern': 'Vague language may lead to disputes'
+            })
         
         return flagged
\ No newline at end of file
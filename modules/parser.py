@@ -1,42 +1,97 @@
-import PyPDF2
-import pdfplumber
-from docx import Document
+import numpy as np
+import io
 import re
 
+
+class SectionIndex:
+    """Detected section headers as a compact (position, header_id) array plus a header table"""
+    dtype = np.dtype([('position', np.int32), ('header_id', np.int32)])
+    
+    def __init__(self, records=None, headers=None):
+        self.records = records if records is not None else np.empty(0, dtype=self.dtype)
+        self.headers = headers if headers is not None else []
+    
+    @property
+    def positions(self):
+        return self.records['position']
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def to_list(self):
+        """Convert to the legacy list of {'header', 'position'} dicts"""
+        return [
+            {'header': self.headers[header_id], 'position': position}
+            for position, header_id in self.records.tolist()
+        ]
+
+
+SECTION_PATTERN = re.compile(
+    r'(article|section|clause)\s+(\d+)|(parties|definitions|scope|term|payment|liability)',
+    re.IGNORECASE
+)
+
+
+def detect_sections(text):
+    """Detect contract sections in a single pass over the text"""
+    if not text or len(text) < 10:
+        return SectionIndex()
+    
+    # Intern header strings so each match only stores a small id
+    header_ids = {}
+    positions = []
+    ids = []
+    for match in SECTION_PATTERN.finditer(text):
+        positions.append(match.start())
+        ids.append(header_ids.setdefault(match.group(0), len(header_ids)))
+    
+    records = np.empty(len(positions), dtype=SectionIndex.dtype)
+    records['position'] = positions
+    records['header_id'] = ids
+    return SectionIndex(records, list(header_ids))
+
+
 class ContractParser:
     def __init__(self):
         self.supported_formats = ['.pdf', '.docx', '.txt']
     
-    def parse_document(self, file_path, file_type):
-        """Parse uploaded contract document"""
+    def parse_document(self, data, file_type):
+        """Parse uploaded contract document from its raw bytes (bytes or memoryview)"""
         if file_type == 'pdf':
-            return self._parse_pdf(file_path)
+            return self._parse_pdf(data)
         elif file_type == 'docx':
-            return self._parse_docx(file_path)
+            return self._parse_docx(data)
         else:
-            return self._parse_txt(file_path)
+            return self._parse_txt(data)
     
-    def _parse_pdf(self, file_path):
+    def _parse_pdf(self, data):
         """Extract text from PDF"""
+        import fitz
+        
         text = ""
         metadata = {}
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                metadata['pages'] = len(pdf.pages)
-                for page in pdf.pages:
-                    page_text = page.extract_text()
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                metadata['pages'] = doc.page_count
+                for page in doc:
+                    page_text = page.get_text("text")
                     if page_text:
                         text += page_text + "\n\n"
         except Exception as e:
+            metadata['error'] = str(e)
+        
+        # Fall back to pdfplumber when PyMuPDF finds no text layer
+        if not text.strip():
             try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    metadata['pages'] = len(pdf_reader.pages)
-                    for page in pdf_reader.pages:
+                import pdfplumber
+                with pdfplumber.open(io.BytesIO(data)) as pdf:
+                    metadata['pages'] = len(pdf.pages)
+                    for page in pdf.pages:
                         page_text = page.extract_text()
                         if page_text:
                             text += page_text + "\n\n"
+                metadata.pop('error', None)
             except Exception as e2:
                 text = "Could not extract text from PDF"
                 metadata['error'] = str(e2)
@@ -44,7 +99,7 @@ class ContractParser:
         if not text.strip():
             text = "No text extracted from PDF"
         
-        sections = self._detect_sections(text)
+        sections = detect_sections(text)
         
         return {
             'raw_text': text,
@@ -52,12 +107,13 @@ class ContractParser:
             'metadata': metadata
         }
     
-    def _parse_docx(self, file_path):
+    def _parse_docx(self, data):
         """Extract text from Word document"""
         try:
-            doc = Document(file_path)
+            from docx import Document
+            doc = Document(io.BytesIO(data))
             text = "\n\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-            sections = self._detect_sections(text)
+            sections = detect_sections(text)
             return {
                 'raw_text': text,
                 'sections': sections,
@@ -66,53 +122,27 @@ class ContractParser:
         except Exception as e:
             return {
                 'raw_text': "Error reading Word document",
-                'sections': [],
+                'sections': SectionIndex(),
                 'metadata': {'error': str(e)}
             }
     
-    def _parse_txt(self, file_path):
+    def _parse_txt(self, data):
         """Parse plain text file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
+            text = str(data, 'utf-8')
         except:
             try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    text = f.read()
+                text = str(data, 'latin-1')
             except Exception as e:
                 return {
                     'raw_text': "Error reading text file",
-                    'sections': [],
+                    'sections': SectionIndex(),
                     'metadata': {'error': str(e)}
                 }
         
-        sections = self._detect_sections(text)
+        sections = detect_sections(text)
         return {
             'raw_text': text,
             'sections': sections,
             'metadata': {}
         }
-    
-    def _detect_sections(self, text):
-        """Detect contract sections"""
-        if not text or len(text) < 10:
-            return []
-        
-        sections = []
-        patterns = [
-            r'(?i)(article|section|clause)\s+(\d+)',
-            r'(?i)(parties|definitions|scope|term|payment|liability)'
-        ]
-        
-        for pattern in patterns:
-            try:
-                matches = re.finditer(pattern, text)
-                for match in matches:
-                    sections.append({
-                        'header': match.group(0),
-                        'position': match.start()
-                    })
-            except:
-                pass
-        
-        return sections
\ No newline at end of file
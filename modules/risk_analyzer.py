@@ -1,6 +1,68 @@
 import re
 import json
+import threading
 from typing import Dict, List
+from modules.parser import detect_sections
+from modules.text_index import as_text_index, memoize_by_text
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# Contracts longer than this are only scanned around section headers
+LARGE_TEXT_THRESHOLD = 200_000
+SECTION_WINDOW = 2_000
+
+# Hyperscan's Unicode tables differ from re's in both directions, and its \s
+# skips \x1c-\x1f; on the rest of ASCII the two agree. The prefilter widens
+# every class escape to accept any non-ASCII character, so it never rejects
+# text that re would match
+HS_LOOSE_CHARS = r'\x1c-\x1f\x{80}-\x{10ffff}'
+HS_CLASS_SUPERSETS = {
+    r'\s': r'\s' + HS_LOOSE_CHARS,
+    r'\S': r'\S\x{80}-\x{10ffff}',
+    r'\d': r'\d\x{80}-\x{10ffff}',
+    r'\D': r'\D\x{80}-\x{10ffff}',
+    r'\w': r'\w\x{80}-\x{10ffff}',
+    r'\W': r'\W\x{80}-\x{10ffff}',
+}
+# Word boundaries follow each engine's \w; dropping them only widens a match
+HS_DROPPED_ESCAPES = {r'\b', r'\B'}
+HS_TOKEN = re.compile(r'\\.|.', re.S)
+# re's IGNORECASE also matches 'i' against 'İ' and 'ı'; Hyperscan does not
+HS_TEXT_FOLD = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+
+
+def _hyperscan_expression(pattern: str) -> bytes:
+    """Hyperscan expression matching at least everything the re pattern does"""
+    parts = []
+    class_start = None  # index in parts of an open character set's '['
+    negated = False
+    for token in HS_TOKEN.findall(pattern.removeprefix('(?i)')):
+        if class_start is None:
+            if token == '[':
+                class_start, negated = len(parts), False
+            elif token in HS_CLASS_SUPERSETS:
+                token = f'[{HS_CLASS_SUPERSETS[token]}]'
+            elif token in HS_DROPPED_ESCAPES:
+                token = ''
+        elif token == '^' and len(parts) == class_start + 1 and not negated:
+            negated = True
+            class_start += 1
+        elif token == ']' and len(parts) > class_start + 1:
+            if negated:
+                # Widening inside [^...] would narrow it; accept the loose
+                # characters alongside instead
+                parts[class_start - 1] = '(?:['
+                token = f']|[{HS_LOOSE_CHARS}])'
+            class_start = None
+        elif token in HS_CLASS_SUPERSETS and not negated:
+            token = HS_CLASS_SUPERSETS[token]
+        parts.append(token)
+    return ''.join(parts).encode('utf-8')
+
 
 class RiskAnalyzer:
     def __init__(self):
@@ -61,9 +123,107 @@ class RiskAnalyzer:
                 ]
             }
         }
+        
+        # Essential elements under Indian Contract Act
+        self.essential_elements = {
+            'consideration': r'(?i)(consideration|valuable\s+consideration|monetary|payment)',
+            'free_consent': r'(?i)(consent|agree|acceptance|mutual\s+understanding)',
+            'competent_parties': r'(?i)(major|age\s+of\s+majority|sound\s+mind|competent)',
+            'lawful_object': r'(?i)(lawful\s+purpose|legal\s+object|legitimate)'
+        }
+        
+        # Compile patterns once so each analysis skips the re module's pattern
+        # cache; flattened to (level, category, pattern) in declaration order
+        self.compiled_risk = [
+            (level, category, re.compile(pattern))
+            for level, categories in self.risk_patterns.items()
+            for category, patterns in categories.items()
+            for pattern in patterns
+        ]
+        
+        # Hyperscan prefilter: one SIMD pass reports which risk patterns may
+        # occur, so only those are run through re. Expressions are supersets
+        # of the re patterns, so a rejected pattern can never have matched
+        if HAS_HYPERSCAN:
+            risk_expressions = [
+                _hyperscan_expression(pattern.pattern)
+                for _, _, pattern in self.compiled_risk
+            ]
+            flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 |
+                     hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH)
+            self.hs_risk_db = hyperscan.Database()
+            self.hs_risk_db.compile(
+                expressions=risk_expressions,
+                ids=list(range(len(risk_expressions))),
+                elements=len(risk_expressions),
+                flags=[flags] * len(risk_expressions)
+            )
+            # Scratch space must not be shared between concurrent scans
+            self._hs_local = threading.local()
+        self.compiled_elements = {
+            element: re.compile(pattern)
+            for element, pattern in self.essential_elements.items()
+        }
     
-    def analyze_contract(self, text: str, entities: Dict) -> Dict:
-        """Comprehensive risk analysis"""
+    def _scan_windows(self, text: str, sections=None) -> List[tuple]:
+        """(start, end) spans of text to scan for risks"""
+        if len(text) <= LARGE_TEXT_THRESHOLD:
+            return [(0, len(text))]
+        
+        if sections is None:
+            sections = detect_sections(text)
+        if not len(sections):
+            return [(0, len(text))]
+        
+        # Merge overlapping windows around each section header
+        windows = []
+        for position in sorted(sections.positions.tolist()):
+            start = max(0, position - SECTION_WINDOW)
+            end = min(len(text), position + SECTION_WINDOW)
+            if windows and start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+            else:
+                windows.append((start, end))
+        return windows
+    
+    def _find_risks(self, text: str, windows: List[tuple]):
+        """Iterate (level, category, match) for every risk pattern match in the windows
+        
+        Each pattern is matched on its own, so overlapping matches of different
+        patterns are all reported.
+        """
+        candidates = self.compiled_risk
+        
+        if HAS_HYPERSCAN:
+            scratch = getattr(self._hs_local, 'scratch', None)
+            if scratch is None:
+                scratch = self._hs_local.scratch = hyperscan.Scratch(self.hs_risk_db)
+            
+            present = set()
+            for start, end in windows:
+                self.hs_risk_db.scan(
+                    text[start:end].translate(HS_TEXT_FOLD).encode('utf-8', errors='replace'),
+                    match_event_handler=lambda id, start, end, flags, context: present.add(id),
+                    scratch=scratch
+                )
+            candidates = [self.compiled_risk[i] for i in sorted(present)]
+        
+        # pos/endpos keep match offsets relative to the full text
+        for risk_level, category, pattern in candidates:
+            for start, end in windows:
+                for match in pattern.finditer(text, start, end):
+                    yield risk_level, category, match
+    
+    @memoize_by_text()
+    def analyze_contract(self, text: str, entities: Dict, sections=None) -> Dict:
+        """Comprehensive risk analysis
+        
+        Contracts over LARGE_TEXT_THRESHOLD characters are only scanned within
+        SECTION_WINDOW characters of each section header; pass the parser's
+        sections to skip re-detecting them.
+        """
+        text = as_text_index(text).text
+        windows = self._scan_windows(text, sections)
         
         risk_findings = {
             'high': [],
@@ -73,22 +233,18 @@ class RiskAnalyzer:
         }
         
         # Pattern-based detection
-        for risk_level, categories in self.risk_patterns.items():
-            for category, patterns in categories.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, text)
-                    for match in matches:
-                        # Extract context (50 chars before and after)
-                        start = max(0, match.start() - 50)
-                        end = min(len(text), match.end() + 50)
-                        context = text[start:end]
-                        
-                        risk_findings[risk_level].append({
-                            'category': category,
-                            'matched_text': match.group(0),
-                            'context': context,
-                            'position': match.start()
-                        })
+        for risk_level, category, match in self._find_risks(text, windows):
+            # Extract context (50 chars before and after)
+            start = max(0, match.start() - 50)
+            end = min(len(text), match.end() + 50)
+            context = text[start:end]
+            
+            risk_findings[risk_level].append({
+                'category': category,
+                'matched_text': match.group(0),
+                'context': context,
+                'position': match.start()
+            })
         
         # Calculate composite score
         weights = {'high': 10, 'medium': 5, 'low': 1}
@@ -115,19 +271,12 @@ class RiskAnalyzer:
     
     def check_indian_compliance(self, text: str, contract_type: str) -> List[Dict]:
         """Check compliance with Indian Contract Act, 1872 & related laws"""
+        text = as_text_index(text).text
         
         compliance_checks = []
         
-        # Essential elements under Indian Contract Act
-        essential_elements = {
-            'consideration': r'(?i)(consideration|valuable\s+consideration|monetary|payment)',
-            'free_consent': r'(?i)(consent|agree|acceptance|mutual\s+understanding)',
-            'competent_parties': r'(?i)(major|age\s+of\s+majority|sound\s+mind|competent)',
-            'lawful_object': r'(?i)(lawful\s+purpose|legal\s+object|legitimate)'
-        }
-        
-        for element, pattern in essential_elements.items():
-            if not re.search(pattern, text):
+        for element, pattern in self.compiled_elements.items():
+            if not pattern.search(text):
                 compliance_checks.append({
                     'element': element,
                     'status': 'MISSING',
@@ -0,0 +1,119 @@
+import re
+import copy
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property, wraps
+from typing import Iterator, List, Tuple
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+# Terminal punctuation plus the whitespace that follows it
+SENTENCE_SPLITTER = re.compile(r'[.!?]+\s*')
+
+
+def iter_sentences(text: str) -> Iterator[Tuple[int, str]]:
+    """Lazily yield (start offset, stripped sentence) pairs in one pass"""
+    pos = 0
+    for match in SENTENCE_SPLITTER.finditer(text):
+        sent = text[pos:match.start()].strip()
+        if sent:
+            yield pos, sent
+        pos = match.end()
+    sent = text[pos:].strip()
+    if sent:
+        yield pos, sent
+
+
+@dataclass
+class TextIndex:
+    """Contract text plus derived views, computed once and shared by every analysis stage"""
+    text: str
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased text; map offsets back with text_offset"""
+        return self.text.lower()
+
+    @cached_property
+    def lower_expansions(self) -> List[int]:
+        """Offsets in lower of the characters lowercasing inserted"""
+        # 'İ' is the only character whose lowercase form is longer than
+        # itself: it becomes 'i' followed by a combining dot
+        if len(self.lower) == len(self.text):
+            return []
+        return [m.start() + i + 1 for i, m in enumerate(re.finditer('\u0130', self.text))]
+
+    @cached_property
+    def sentences(self) -> List[Tuple[int, str]]:
+        """(start offset, sentence) pairs, materialized on first use"""
+        return list(iter_sentences(self.text))
+
+    @cached_property
+    def digest(self) -> tuple:
+        """Fast content hash used as a memoization key"""
+        data = self.text.encode('utf-8', errors='surrogatepass')
+        if HAS_XXHASH:
+            return xxhash.xxh64_intdigest(data), len(data)
+        return hashlib.blake2b(data, digest_size=8).digest(), len(data)
+
+    @cached_property
+    def sentence_starts(self) -> List[int]:
+        return [start for start, _ in self.sentences]
+
+    def text_offset(self, lower_pos: int) -> int:
+        """Offset in text of the character at lower_pos in lower"""
+        return lower_pos - bisect_right(self.lower_expansions, lower_pos)
+
+    def sentence_at(self, pos: int) -> int:
+        """Index of the sentence containing character offset pos"""
+        return bisect_right(self.sentence_starts, pos) - 1
+
+
+def as_text_index(text) -> TextIndex:
+    """Accept either raw text or an existing TextIndex"""
+    return text if isinstance(text, TextIndex) else TextIndex(text)
+
+
+def memoize_by_text(maxsize=4):
+    """Memoize an analyzer method on a hash of its text argument
+
+    Any further arguments are passed through on a miss but are not part of
+    the key, so they must be derived from the same text. The cache lives on
+    the instance, so it is freed with the analyzer. Every call returns its
+    own deep copy, so callers may mutate results without corrupting the
+    cache; callers that already cache results can skip both through
+    method.__wrapped__.
+    """
+    def decorator(method):
+        attr = f'_memo_{method.__name__}'
+
+        @wraps(method)
+        def wrapper(self, text, *args, **kwargs):
+            index = as_text_index(text)
+            key = index.digest
+            # setdefault is atomic, so concurrent first calls share one cache
+            cache, lock = self.__dict__.setdefault(attr, (OrderedDict(), threading.Lock()))
+            with lock:
+                cached = cache.get(key)
+                if cached is not None:
+                    cache.move_to_end(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+            result = method(self, index, *args, **kwargs)
+            cached = copy.deepcopy(result)
+            with lock:
+                cache[key] = cached
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        return wrapper
+    return decorator
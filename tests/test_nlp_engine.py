@@ -0,0 +1,60 @@
+import random
+import re
+
+import pytest
+
+from modules.nlp_engine import LegalNLPEngine
+
+AMBIGUOUS_TEXTS = [
+    "The Vendor shall respond promptly. Fees are approximately ₹5000 and may change!",
+    # Terms at the very start and end of sentences
+    "Reasonable. Material? Promptly! could be done in good faith",
+    "  best efforts...as soon as possible!!around  ",
+    # 'İ' lowercases to two characters, shifting every later offset
+    "İSTANBUL office. A MATERİAL breach. The Vendor may act in good faith. İ",
+    "Nothing vague here. Nor here",
+    "",
+]
+
+
+def baseline_ambiguous(engine, text):
+    """Per-sentence substring scan as originally implemented in detect_ambiguous_terms"""
+    sentences = re.split(r'[.!?]+', text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+
+    flagged = []
+    for sent in sentences:
+        sent_lower = sent.lower()
+        found_terms = [term for term in engine.ambiguous_terms if term in sent_lower]
+        if found_terms:
+            flagged.append({
+                'sentence': sent,
+                'terms': found_terms,
+                'concern': 'Vague language may lead to disputes'
+            })
+    return flagged
+
+
+def random_text(rng, engine):
+    pieces = engine.ambiguous_terms + [
+        'İ', 'MAY', 'Good Faith', 'material', 'the', 'vendor', 'ı', 'ß', 'Σ',
+        'MATER', 'AL', 'M', 'GHT', ' ', ' ', ' ', '. ', '!', '?', '...', '\n', 'a', 'l',
+    ]
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return LegalNLPEngine()
+
+
+@pytest.mark.parametrize('text', AMBIGUOUS_TEXTS)
+def test_ambiguous_terms_match_baseline(engine, text):
+    assert engine.detect_ambiguous_terms(text) == baseline_ambiguous(engine, text)
+
+
+def test_ambiguous_terms_match_baseline_on_random_text(engine):
+    rng = random.Random(0)
+    for _ in range(500):
+        text = random_text(rng, engine)
+        assert engine.detect_ambiguous_terms(text) == baseline_ambiguous(engine, text), text
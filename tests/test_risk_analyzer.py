@@ -0,0 +1,198 @@
+import gc
+import re
+import weakref
+
+import pytest
+
+import modules.risk_analyzer as risk_analyzer
+from modules.parser import detect_sections
+from modules.risk_analyzer import LARGE_TEXT_THRESHOLD, SECTION_WINDOW, RiskAnalyzer
+
+# Several risky clauses on one line, so greedy `.*` patterns overlap others
+SINGLE_LINE = (
+    "The Vendor accepts unlimited liability without any limit. "
+    "Company may terminate without notice and may terminate at will at its sole discretion to terminate. "
+    "Disputes are subject to the exclusive jurisdiction of courts at Mumbai only. "
+    "The Vendor shall pay liquidated damages for any breach, with a penalty of ₹50000. "
+    "Vendor shall indemnify and hold harmless the Client and defend against any claims and indemnification for losses. "
+    "This agreement is automatically renewed unless 30 days notice is given to renew. "
+) * 3
+
+MULTI_LINE = """SERVICE AGREEMENT between Acme Technologies Pvt and Bharat Supplies Limited.
+Clause 3 Liability. The Vendor accepts entire liability for all losses.
+All intellectual property created shall be transferred to the Client; ownership vests exclusively in the Client.
+Non-compete for 2 years; Vendor shall not engage in any competing business or restricted similar activity.
+Vendor shall indemnify and hold harmless the Client. Notice period of 30 days applies.
+Confidential Information is covered by the non-disclosure terms. Auto-renewal applies."""
+
+# Characters re matches but Hyperscan's classes and case folding do not
+UNICODE_EDGE_CASES = [
+    "The Vendor accepts unlimited\x1cliability.",
+    "THE VENDOR ACCEPTS UNL\u0130M\u0130TED L\u0130AB\u0130L\u0130TY.",
+    "Vendor shall pay a penalty of \U00011950 for late delivery.",
+    "Disputes go to courts at \U000104B0 only.",
+]
+
+# Neutral text with no risk phrases and no section header words
+FILLER = "Ordinary wording about deliveries and schedules. "
+
+
+def long_contract(*pieces):
+    """Join (offset, snippet) pairs into filler text longer than LARGE_TEXT_THRESHOLD"""
+    text = FILLER * (LARGE_TEXT_THRESHOLD // len(FILLER) + 1)
+    for offset, snippet in pieces:
+        text = text[:offset] + snippet + text[offset + len(snippet):]
+    return text
+
+
+def expected_finding(text, snippet, position):
+    return {
+        'category': 'auto_renewal',
+        'matched_text': snippet,
+        'context': text[max(0, position - 50):position + len(snippet) + 50],
+        'position': position
+    }
+
+
+def baseline_findings(analyzer, text):
+    """Per-pattern scan as originally implemented in analyze_contract"""
+    findings = {'high': [], 'medium': [], 'low': []}
+    for risk_level, categories in analyzer.risk_patterns.items():
+        for category, patterns in categories.items():
+            for pattern in patterns:
+                for match in re.finditer(pattern, text):
+                    start = max(0, match.start() - 50)
+                    end = min(len(text), match.end() + 50)
+                    findings[risk_level].append({
+                        'category': category,
+                        'matched_text': match.group(0),
+                        'context': text[start:end],
+                        'position': match.start()
+                    })
+    return findings
+
+
+def hyperscan_modes():
+    modes = [False]
+    try:
+        import hyperscan  # noqa: F401
+        modes.append(True)
+    except ImportError:
+        pass
+    return modes
+
+
+@pytest.fixture(params=hyperscan_modes(), ids=lambda mode: 'hyperscan' if mode else 're')
+def analyzer(request, monkeypatch):
+    monkeypatch.setattr(risk_analyzer, 'HAS_HYPERSCAN', request.param)
+    return RiskAnalyzer()
+
+
+@pytest.mark.parametrize('text', [SINGLE_LINE, MULTI_LINE, ''])
+def test_findings_match_baseline(analyzer, text):
+    result = analyzer.analyze_contract(text, {})
+    expected = baseline_findings(analyzer, text)
+    for level in ('high', 'medium', 'low'):
+        assert result[level] == expected[level]
+
+
+def test_overlapping_risks_are_all_reported(analyzer):
+    result = analyzer.analyze_contract(SINGLE_LINE, {})
+    matched = [finding['matched_text'] for finding in result['high']]
+    assert matched.count('terminate at will') == 3
+    assert sum(f['category'] == 'indemnity_broad' for f in result['medium']) == 3
+    assert result['level'] == 'HIGH RISK'
+
+
+@pytest.mark.parametrize('text', UNICODE_EDGE_CASES)
+def test_prefilter_keeps_unicode_edge_cases(analyzer, text):
+    result = analyzer.analyze_contract(text, {})
+    expected = baseline_findings(analyzer, text)
+    assert any(expected.values())
+    for level in ('high', 'medium', 'low'):
+        assert result[level] == expected[level]
+
+
+def test_memoized_result_is_not_shared(analyzer):
+    first = analyzer.analyze_contract(MULTI_LINE, {})
+    first['high'].clear()
+    first['composite_score'] = 0
+    second = analyzer.analyze_contract(MULTI_LINE, {})
+    assert second['high'] == baseline_findings(analyzer, MULTI_LINE)['high']
+    assert second['composite_score'] > 0
+
+
+def test_memoized_results_do_not_keep_analyzer_alive():
+    analyzer = RiskAnalyzer()
+    analyzer.analyze_contract(MULTI_LINE, {})
+    ref = weakref.ref(analyzer)
+    del analyzer
+    gc.collect()
+    assert ref() is None
+
+
+# Code points where re and Hyperscan classify characters differently, plus ASCII
+CLASS_EDGE_CHARS = [chr(cp) for cp in range(0x80)] + [
+    '\u0130', '\u0131', '\u017f', '\u212a', '\u0085', '\u00a0', '\u0560', '\u1885',
+    '\u180e', '\u3000', '\U00010d30', '\U00011950', '\U000104b0', '₹',
+]
+
+
+@pytest.mark.parametrize('pattern', [
+    r'\s', r'\S', r'\d', r'\D', r'\w', r'\W', r'[\s,]', r'[^\s,]', r'[^\W\d]',
+    r'[]a]', r'[^]a]', r'[i]', r'[^x]', r'.', r'\bi',
+])
+def test_hyperscan_expression_is_superset(pattern):
+    hyperscan = pytest.importorskip('hyperscan')
+    flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 |
+             hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH)
+    database = hyperscan.Database()
+    expression = risk_analyzer._hyperscan_expression(pattern)
+    database.compile(expressions=[b'^' + expression + b'$'], ids=[0], elements=1, flags=[flags])
+    
+    regex = re.compile('(?i)' + pattern)
+    for char in CLASS_EDGE_CHARS:
+        if not regex.fullmatch(char):
+            continue
+        hits = []
+        database.scan(
+            char.translate(risk_analyzer.HS_TEXT_FOLD).encode('utf-8'),
+            match_event_handler=lambda *args: hits.append(args)
+        )
+        assert hits, (pattern, char)
+
+
+@pytest.mark.parametrize('pass_sections', [False, True], ids=['detected', 'passed'])
+def test_long_contract_scans_near_headers_only(analyzer, pass_sections):
+    header = 150_000
+    near = header + SECTION_WINDOW // 2
+    far = header + 3 * SECTION_WINDOW
+    text = long_contract((header, "Section 7 "), (near, "auto-renewal"), (far, "auto-renewal"))
+    sections = detect_sections(text) if pass_sections else None
+    
+    result = analyzer.analyze_contract(text, {}, sections)
+    assert len(baseline_findings(analyzer, text)['medium']) == 2
+    assert result['medium'] == [expected_finding(text, "auto-renewal", near)]
+
+
+def test_long_contract_merges_overlapping_windows(analyzer):
+    first = 120_000
+    second = first + SECTION_WINDOW + SECTION_WINDOW // 2
+    between = first + SECTION_WINDOW // 2 + SECTION_WINDOW // 4
+    text = long_contract((first, "Article 1 "), (second, "Article 2 "), (between, "auto-renewal"))
+    
+    result = analyzer.analyze_contract(text, {})
+    assert result['medium'] == [expected_finding(text, "auto-renewal", between)]
+
+
+def test_long_contract_without_headers_is_scanned_in_full(analyzer):
+    end = LARGE_TEXT_THRESHOLD - 100
+    text = long_contract((10, "auto-renewal"), (end, "auto-renewal"))
+    assert not len(detect_sections(text))
+    
+    result = analyzer.analyze_contract(text, {})
+    assert result['medium'] == [
+        expected_finding(text, "auto-renewal", 10),
+        expected_finding(text, "auto-renewal", end),
+    ]
+